@@ -1,29 +1,75 @@
 # app/db/client.py
-from redis import Redis
+# No parser is configured here on purpose: when the `hiredis` package is installed,
+# redis-py uses its C-based reply parser automatically
+# (check with `redis.utils.HIREDIS_AVAILABLE`).
+from functools import lru_cache
+from redis import Redis, BlockingConnectionPool
 import redis.asyncio as aioredis
-from .config import redis_config
-
-
-sync_redis_client = Redis.from_url(
-    redis_config.connection_url,
-    db=redis_config.db_index,
-    decode_responses=redis_config.decode_responses,
-)
-"""
-Synchronous Redis client configured via application settings.
-
-This client provides the foundational connection interface for all synchronous
-cache operations against the Redis instance.
-"""
-
-async_redis_client = aioredis.from_url(
-    redis_config.connection_url,
-    db=redis_config.db_index,
-    decode_responses=redis_config.decode_responses,
-)
-"""
-Asynchronous Redis client configured via application settings.
-
-This client provides the foundational connection interface for all asynchronous
-cache operations against the Redis instance.
-"""
\ No newline at end of file
+from .config import get_redis_config
+
+
+@lru_cache(maxsize=1)
+def get_sync_client() -> Redis:
+    """
+    Return the synchronous Redis client configured via application settings.
+
+    This client provides the foundational connection interface for all synchronous
+    cache operations against the Redis instance.
+
+    Returns
+    -------
+    Redis
+        Client singleton, created (together with its connection pool) on first call.
+
+    Notes
+    -----
+    1. The client is backed by a `BlockingConnectionPool`. Unlike the default
+       `ConnectionPool`, which opens a new connection whenever all existing ones are
+       busy, it never exceeds `pool_size` connections: callers wait (up to
+       `pool_timeout` seconds) for a connection to be released. This prevents
+       connection storms under bursts of concurrent requests.
+    2. The client is built lazily, so importing this module (or the decorators)
+       neither parses the `.env` file nor allocates a connection pool — only the
+       first cache operation does.
+    """
+
+    config = get_redis_config()
+    pool = BlockingConnectionPool.from_url(
+        config.connection_url,
+        db=config.db_index,
+        decode_responses=config.decode_responses,
+        max_connections=config.pool_size,
+        timeout=config.pool_timeout,
+    )
+    return Redis(connection_pool=pool)
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> aioredis.Redis:
+    """
+    Return the asynchronous Redis client configured via application settings.
+
+    This client provides the foundational connection interface for all asynchronous
+    cache operations against the Redis instance.
+
+    Returns
+    -------
+    redis.asyncio.Redis
+        Client singleton, created (together with its connection pool) on first call.
+
+    Notes
+    -----
+    The client is backed by a bounded `redis.asyncio.BlockingConnectionPool` sized
+    like the synchronous one (see `get_sync_client`): coroutines that find it
+    exhausted wait for a connection to be released instead of opening new ones.
+    """
+
+    config = get_redis_config()
+    pool = aioredis.BlockingConnectionPool.from_url(
+        config.connection_url,
+        db=config.db_index,
+        decode_responses=config.decode_responses,
+        max_connections=config.pool_size,
+        timeout=config.pool_timeout,
+    )
+    return aioredis.Redis(connection_pool=pool)
\ No newline at end of file
@@ -0,0 +1,244 @@
+# app/db/coalescer.py
+import asyncio
+import logging
+from collections import deque
+from weakref import WeakKeyDictionary
+from redis.asyncio import Redis as AsyncRedis
+
+
+logger = logging.getLogger(__name__)
+
+
+class Coalescer:
+    """
+    Automatic pipelining of asynchronous cache reads and writes.
+
+    Commands issued by concurrent coroutines during the same event-loop tick are
+    buffered and sent together on the next tick: all `GET`s become a single
+    `MGET` (or, if some of them refresh the TTL, a pipeline of `GET`/`GETEX`),
+    sent in one pipeline with the `PTTL` of each key, and all `SETEX`s (together
+    with their miss-counter increments) and `UNLINK`s are sent in a single
+    non-transactional pipeline. Writes issued while a write pipeline is in
+    flight are queued and sent together in the next one.
+
+    Parameters
+    ----------
+    client : redis.asyncio.Redis
+        Asynchronous Redis client used to send the batched commands.
+    max_pending_writes : int
+        Maximum number of queued writes. When the queue is full, the oldest
+        pending fire-and-forget write (`setex_nowait`, `expire_nowait`) is
+        dropped; awaited `unlink`s are never dropped. Default is `10000`.
+
+    Notes
+    -----
+    1. Under a burst of concurrent requests (e.g., many handlers calling
+       `get_user` at once) this amortizes the connection-pool acquisition and
+       the network round-trip over all in-flight commands.
+    2. If only one write is pending at flush time, it is sent directly
+       without pipeline overhead.
+    3. It sends all commands through the single `client` it wraps, whose
+       connections are bound to the event loop they were created on. Use it
+       only from that loop (e.g., the application's main loop), not from
+       several loops or threads.
+    4. A failed batch propagates the same exception to every waiting caller.
+       Writes queued with `setex_nowait` have no caller waiting, so their
+       failures are logged instead.
+    5. Write batches are sent one at a time, in the order they were queued, by a
+       single task per event loop. Together with `unlink` sharing the write queue,
+       this guarantees that a write queued before an invalidation never reaches
+       Redis after its `UNLINK` and restores the stale value.
+    6. If Redis is slow or unavailable, writes pile up in the queue rather than
+       in ever more dispatch tasks, and the queue is bounded by
+       `max_pending_writes` (as in `WriteBehind`); for a cache, a dropped
+       write only means one more miss.
+    """
+
+    def __init__(self, client: AsyncRedis, max_pending_writes: int = 10000):
+        self._client = client
+        self._max_pending_writes = max_pending_writes
+        self._reads: WeakKeyDictionary = WeakKeyDictionary()
+        self._writes: WeakKeyDictionary = WeakKeyDictionary()
+        # Task sending the queued writes of each loop, while there are any
+        self._writers: WeakKeyDictionary = WeakKeyDictionary()
+        # Strong references to in-flight dispatch tasks so they are not garbage-collected
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, key: bytes, ex: int | None = None) -> tuple[bytes | None, int]:
+        """
+        Read `key`, batched with other reads issued in the same tick.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        ex : int or None
+            If given, the key's TTL is reset to `ex` seconds on read (`GETEX`).
+            Default is `None` (plain `GET`).
+
+        Returns
+        -------
+        tuple[bytes or None, int]
+            Raw value (or `None` if the key does not exist) and the remaining TTL
+            of the key in milliseconds, as returned by `PTTL` (`-1` if the key
+            has no expiry, `-2` if it does not exist).
+        """
+
+        loop = asyncio.get_running_loop()
+        pending = self._reads.get(loop)
+        if pending is None:
+            pending = self._reads[loop] = {}
+            loop.call_soon(self._flush, loop, self._reads, self._dispatch_reads)
+        future = loop.create_future()
+        pending.setdefault((key, ex), []).append(future)
+        return await future
+
+    def setex_nowait(self, key: bytes, ttl: int, value: bytes, stats_key: bytes | None = None) -> None:
+        """
+        Queue a write of `key` with a TTL and return without waiting for it ("fire-and-forget").
+
+        The write is batched with other writes issued in the same tick. Must be
+        called from a running event loop.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        ttl : int
+            Time-to-live (in seconds) of the entry.
+        value : bytes
+            Serialized value.
+        stats_key : bytes or None
+            Counter incremented alongside the write (e.g., a miss counter).
+            Default is `None` (no counter).
+        """
+
+        if stats_key is None:
+            self._queue_write(None, ("setex", key, ttl, value))
+        else:
+            self._queue_write(None, ("setex", key, ttl, value), ("incr", stats_key))
+
+    def expire_nowait(self, key: bytes, ttl: int) -> None:
+        """
+        Queue a reset of the TTL of `key` (`EXPIRE`) and return without waiting for it.
+
+        The command is batched with the writes issued in the same tick. Must be
+        called from a running event loop.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        ttl : int
+            New time-to-live (in seconds) of the entry.
+        """
+
+        self._queue_write(None, ("expire", key, ttl))
+
+    async def unlink(self, key: bytes) -> None:
+        """
+        Remove `key` from Redis after all writes queued so far have been sent.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue_write(future, ("unlink", key))
+        await future
+
+    def _queue_write(self, future, *commands) -> None:
+        loop = asyncio.get_running_loop()
+        pending = self._writes.get(loop)
+        if pending is None:
+            pending = self._writes[loop] = deque()
+        if len(pending) >= self._max_pending_writes:
+            _drop_oldest_nowait(pending)
+        pending.append((future, commands))
+        if loop not in self._writers:
+            # The task starts on the next tick, so writes of the current tick are sent together
+            self._writers[loop] = loop.create_task(self._send_writes(loop, pending))
+
+    async def _send_writes(self, loop, pending: deque) -> None:
+        try:
+            while pending:
+                batch = list(pending)
+                pending.clear()
+                await self._dispatch_writes(batch)
+        finally:
+            # No `await` since the last check of `pending`: no write can be left behind
+            del self._writers[loop]
+
+    def _flush(self, loop, buffers, dispatch) -> None:
+        pending = buffers.pop(loop, None)
+        if pending:
+            task = loop.create_task(dispatch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch_reads(self, pending: dict[tuple, list[asyncio.Future]]) -> None:
+        # Pending reads are keyed by `(key, ex)` pairs
+        reads = list(pending)
+        plain = all(ex is None for _, ex in reads)
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                if plain:
+                    pipe.mget([key for key, _ in reads])
+                else:
+                    for key, ex in reads:
+                        if ex is None:
+                            pipe.get(key)
+                        else:
+                            pipe.getex(key, ex=ex)
+                for key, _ in reads:
+                    pipe.pttl(key)
+                replies = await pipe.execute()
+        except Exception as exc:
+            for futures in pending.values():
+                _fail(futures, exc)
+            return
+
+        values = replies[0] if plain else replies[:len(reads)]
+        for read, value, pttl in zip(reads, values, replies[-len(reads):]):
+            for future in pending[read]:
+                if not future.done():
+                    future.set_result((value, pttl))
+
+    async def _dispatch_writes(self, pending: list[tuple]) -> None:
+        # Pending writes are `(future, commands)` pairs, each command a `(name, *args)` tuple
+        futures = [future for future, _ in pending if future is not None]
+        commands = [command for _, entry in pending for command in entry]
+        try:
+            if len(commands) == 1:
+                name, *args = commands[0]
+                await getattr(self._client, name)(*args)
+            else:
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for name, *args in commands:
+                        getattr(pipe, name)(*args)
+                    await pipe.execute()
+        except Exception as exc:
+            if len(futures) < len(pending):
+                logger.exception("Failed to write %d cache entries to Redis", len(pending))
+            _fail(futures, exc)
+            return
+
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
+
+
+def _drop_oldest_nowait(pending: deque) -> None:
+    # Drop the oldest write nobody waits for; awaited ones (`unlink`) are always kept
+    for i, (future, _) in enumerate(pending):
+        if future is None:
+            del pending[i]
+            return
+
+
+def _fail(futures: list[asyncio.Future], exc: BaseException) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(exc)
@@ -1,4 +1,5 @@
 # app/db/config.py
+from functools import cached_property, lru_cache
 from urllib.parse import quote_plus
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
@@ -34,6 +35,15 @@ class RedisConfig(BaseSettings):
         Whether the Redis client should automatically decode raw byte responses
         to Python strings via UTF-8 decoding (i.e. ``bytes.decode("utf-8")``).
         Default is ``False``.
+    pool_size : int
+        Maximum number of connections kept by each client's connection pool
+        (one pool for the synchronous client, one for the asynchronous one).
+        Should match the expected concurrency (threads or in-flight coroutines).
+        Default is `32`.
+    pool_timeout : float
+        Time in seconds to wait for a free connection when the pool is exhausted
+        before raising `redis.exceptions.ConnectionError`.
+        Default is `2.0`.
 
     Notes:
     ------
@@ -89,8 +99,10 @@ class RedisConfig(BaseSettings):
     ttl_fast: int = Field(default=300, ge=0)
     ttl_slow: int = Field(default=3600, ge=0)
     decode_responses: bool = Field(default=False)
+    pool_size: int = Field(default=32, ge=1)
+    pool_timeout: float = Field(default=2.0, gt=0)
 
-    @property
+    @cached_property
     def connection_url(self) -> str:
         """
         Build Redis connection URL from configuration settings.
@@ -105,6 +117,10 @@ class RedisConfig(BaseSettings):
         -----
         The password is URL-encoded using `quote_plus` to safely handle
         special characters that might be present in the password string.
+
+        Since the configuration is immutable, the URL is built on first access
+        and cached on the instance (`cached_property` stores it in the instance
+        `__dict__` directly, which Pydantic allows even for frozen models).
         """
 
         return (
@@ -113,9 +129,29 @@ class RedisConfig(BaseSettings):
             f"{self.host}:{self.external_port}"
         )
 
-# Initialize Redis configuration singleton
-# Since Redis server settings are static for the application's lifetime
-# and any configuration changes require a full application restart,
-# it is safe to instantiate the config once at module level and reuse
-# it throughout the application as a singleton.
-redis_config = RedisConfig()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_redis_config() -> RedisConfig:
+    """
+    Return the Redis configuration singleton.
+
+    Since Redis server settings are static for the application's lifetime
+    and any configuration changes require a full application restart,
+    it is safe to instantiate the config once and reuse it throughout
+    the application as a singleton.
+
+    Returns
+    -------
+    RedisConfig
+        Configuration instance, created on first call.
+
+    Notes
+    -----
+    The configuration is created lazily rather than at module level, so that
+    importing this module (e.g., from CLI tools or tests that never touch Redis)
+    does not parse the `.env` file or fail on missing credentials. Decorators
+    applied at import time must therefore not call it directly: pass settings
+    such as TTLs as functions instead (e.g., `ttl=lambda: get_redis_config().ttl_fast`,
+    see `redis_cached`).
+    """
+
+    return RedisConfig()
\ No newline at end of file
@@ -1,9 +1,107 @@
 # app/db/decorators.py
-from functools import wraps
+import asyncio
+import hashlib
+import io
+import pickle
+import sys
+import warnings
+from random import random
+from functools import wraps, lru_cache
 from typing import Any, Callable
-from inspect import iscoroutinefunction
-from .client import sync_redis_client, async_redis_client
+from inspect import iscoroutinefunction, signature, Parameter
+from .client import get_sync_client, get_async_client
 from .serializers import Serializer
+from .local_cache import LocalTTLCache, MISS
+from .coalescer import Coalescer
+from .single_flight import SingleFlight, AsyncSingleFlight
+from .write_behind import WriteBehind
+
+
+LOCAL_CACHE_MAXSIZE = 1024
+"""
+Maximum number of entries kept in the in-process L1 cache of each decorated function.
+"""
+
+
+@lru_cache(maxsize=1)
+def get_async_coalescer() -> Coalescer:
+    """
+    Return the coalescer batching the `GET`s, `SETEX`s and `UNLINK`s issued by
+    concurrent async cached calls within the same event-loop tick (see `Coalescer`).
+
+    Like the clients, it is created lazily on first use.
+    """
+
+    return Coalescer(get_async_client())
+
+
+@lru_cache(maxsize=1)
+def get_write_behind() -> WriteBehind:
+    """
+    Return the background writer sending the `SETEX`s of synchronous cache misses,
+    and the `UNLINK`s of invalidations ordered after them (see `WriteBehind`).
+
+    Like the clients, it is created lazily on first use.
+    """
+
+    return WriteBehind(get_sync_client)
+
+
+def _lazy_ttl(ttl: int | Callable[[], int]) -> Callable[[], int]:
+    """
+    Return a function returning `ttl`.
+
+    If `ttl` is itself a function (e.g., `lambda: get_redis_config().ttl_fast`),
+    it is called once, on first use, and its result is reused afterwards. This lets
+    decorators be applied at import time without reading the configuration.
+    """
+
+    if callable(ttl):
+        return lru_cache(maxsize=1)(ttl)
+    return lambda: ttl
+
+
+def _local_ttl(pttl: int, ratio: float = 1.0) -> float | None:
+    """
+    Return how long a value read from Redis may stay in the L1 cache.
+
+    Parameters
+    ----------
+    pttl : int
+        Remaining TTL of the Redis entry in milliseconds, as returned by `PTTL`
+        (`-1` if the key has no expiry, `-2` if it no longer exists).
+    ratio : float
+        Share of the remaining TTL the L1 entry may live for (see `redis_cached`).
+        Default is `1.0`.
+
+    Returns
+    -------
+    float or None
+        Lifetime in seconds to pass to `LocalTTLCache.set`, which caps it to the
+        cache's own TTL: `None` if the Redis entry has no expiry, otherwise the
+        given share of its remaining TTL (non-positive if it no longer exists, so
+        nothing is cached).
+    """
+
+    return None if pttl == -1 else pttl / 1000 * ratio
+
+
+def _read_sync(client, key: bytes, ex: int | None = None) -> tuple[bytes | None, int]:
+    """
+    Read `key` together with its remaining TTL in one round-trip.
+
+    Synchronous counterpart of `Coalescer.get`: `GET` (or `GETEX` if `ex` is
+    given) and `PTTL` are sent in a single non-transactional pipeline.
+    """
+
+    with client.pipeline(transaction=False) as pipe:
+        if ex is None:
+            pipe.get(key)
+        else:
+            pipe.getex(key, ex=ex)
+        pipe.pttl(key)
+        raw_data, pttl = pipe.execute()
+    return raw_data, pttl
 
 
 def drop_self(args):
@@ -23,24 +121,22 @@ def drop_self(args):
     Notes
     -----
     This helper exists to avoid accidentally including the `self` object (i.e., the
-    instance of a class) in cache key generation. Without dropping `self`, keys would
-    contain unstable representations like:
+    instance of a class) in cache key generation. Without dropping `self`, a key built
+    by string formatting would contain unstable representations like:
 
         "<app.db.services.mock_sync.MockSyncService object at 0x7b110262fcb0>"
 
     Such memory addresses change every time an object is recreated (e.g., on notebook
     reload, process restart) making caching completely ineffective, even as a demonstration.
 
-    While this project is educational and intentionally uses a simple key format
-    (e.g., `f"{prefix}:{args}:{kwargs}"`) to keep Redis integration transparent and
-    human-readable, **not all simplifications are equal**. It's perfectly reasonable
-    to prioritize readable, unhashed keys for learning (this helps users inspect Redis
-    directly and understand what's being cached). However, including volatile runtime
-    details (like object memory addresses) is not a "simplification" — it's a
-    fundamental flaw that breaks the very concept of caching.
+    Even though the arguments are hashed (see `make_cache_key`), `self` would still
+    be pickled as part of the hashed payload, and an instance's state — or the fact
+    that it cannot be pickled at all — has nothing to do with the cached result.
+    Including volatile runtime details (like object memory addresses) is not a
+    "simplification" — it's a fundamental flaw that breaks the very concept of caching.
 
-    Therefore, even in a minimal demo, we exclude `self` to ensure keys remain
-    semantically meaningful and stable across runs—without sacrificing clarity.
+    Therefore, we exclude `self` to ensure keys remain semantically meaningful and
+    stable across runs.
 
     Also, One might consider skipping positional arguments entirely and building cache keys
     from keyword arguments only (e.g., `prefix:{kwargs}`). However, this breaks
@@ -58,7 +154,172 @@ def drop_self(args):
     return args[1:] if args else args
 
 
-def redis_cached(ttl: int, serializer: Serializer):
+class _SortedDict(tuple):
+    """
+    Canonical, order-independent form of a dict argument: its sorted items.
+
+    A dedicated `tuple` subclass is pickled with a reference to its class, so a
+    canonicalized `{"a": 1}` never produces the same key as a literal
+    `(("a", 1),)` tuple argument, nor as the set `{("a", 1)}` (see `_SortedSet`).
+    """
+
+
+class _SortedSet(tuple):
+    """
+    Canonical, order-independent form of a set or frozenset argument: its sorted values.
+    """
+
+
+def _caller_stacklevel() -> int:
+    """
+    Return the `stacklevel` that makes a warning issued by the calling function
+    point at the first frame outside this module, i.e. the code calling the cached
+    function, whichever helpers (`_canon_kwargs`, `redis_cached_batch`, ...) it went through.
+    """
+
+    frame, level = sys._getframe(1), 1
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame, level = frame.f_back, level + 1
+    return level
+
+
+def _canon_value(value: Any) -> Any:
+    """
+    Return an order-independent form of `value` for cache key hashing.
+
+    Dicts and sets compare equal regardless of insertion order but pickle to
+    different bytes, so they are replaced by their sorted items. Other values
+    are returned unchanged: lists, tuples and scalars already pickle
+    deterministically, and containers are intentionally not traversed to keep
+    key building cheap for large arguments (e.g., `input_data`).
+    """
+
+    if isinstance(value, dict):
+        items, canonical = value.items(), _SortedDict
+    elif isinstance(value, (set, frozenset)):
+        items, canonical = value, _SortedSet
+    else:
+        return value
+
+    try:
+        return canonical(sorted(items))
+    except TypeError:
+        warnings.warn(
+            f"Cannot order {type(value).__name__} argument for a stable cache key; "
+            "equal values passed in a different order will be cached separately.",
+            stacklevel=_caller_stacklevel(),
+        )
+        return value
+
+
+def _canon_kwargs(kwargs: dict) -> tuple:
+    """
+    Return keyword arguments as a tuple of `(name, value)` pairs sorted by name.
+
+    Unlike `repr(kwargs)`, the result does not depend on the order in which the
+    arguments were passed: `f(user_id=1, lang="en")` and `f(lang="en", user_id=1)`
+    produce the same cache key.
+    """
+
+    return tuple(sorted((name, _canon_value(value)) for name, value in kwargs.items()))
+
+
+def positional_arg_names(func: Callable) -> tuple[str, ...] | None:
+    """
+    Return the names of the parameters that may be passed positionally after `self`.
+
+    Parameters
+    ----------
+    func : Callable
+        Function (or `functools.wraps`-decorated wrapper) to inspect.
+
+    Returns
+    -------
+    tuple[str, ...] or None
+        Parameter names in declaration order, excluding the first one (`self`),
+        or `None` if the signature has positional-only or variadic positional
+        parameters, whose values cannot be mapped to names.
+    """
+
+    params = list(signature(func).parameters.values())
+    if any(p.kind in (Parameter.POSITIONAL_ONLY, Parameter.VAR_POSITIONAL) for p in params):
+        return None
+    return tuple(p.name for p in params[1:] if p.kind is Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def make_cache_key(
+    key_prefix: bytes,
+    args: tuple,
+    kwargs: dict,
+    arg_names: tuple[str, ...] | None = None,
+) -> bytes:
+    """
+    Build a fixed-size Redis key from a key prefix and call arguments.
+
+    Parameters
+    ----------
+    key_prefix : bytes
+        UTF-8 encoded, namespaced prefix of the cached function, including the
+        trailing `:` separator (e.g., `b"app.db.services.mock_sync.MockSyncService.get_user:"`).
+        It is computed once at decoration time, so no string is built or encoded per call.
+    args : tuple
+        Positional arguments of the call, including `self`.
+    kwargs : dict
+        Keyword arguments of the call.
+    arg_names : tuple[str, ...] or None
+        Names of the positional parameters after `self`
+        (see `positional_arg_names`). Default is `None`.
+
+    Returns
+    -------
+    bytes
+        Key in the format `<prefix>:<16-byte BLAKE2b digest of the arguments>`.
+
+    Notes
+    -----
+    1. The arguments (without `self`, see `drop_self`) and the keyword arguments
+       sorted by name (see `_canon_kwargs`) are pickled and hashed with BLAKE2b. This keeps the key size
+       constant regardless of the argument size (e.g., a large `input_data` list)
+       and avoids building and encoding a multi-kilobyte string on every call.
+    2. If `arg_names` is given, positional arguments are first folded into keyword
+       arguments by name, so `get_user(7)` and `get_user(user_id=7)` share one key.
+       This is what allows `invalidate_redis_cache` to target an entry regardless
+       of how the cached function was called.
+    3. The plain-text prefix is kept in front of the digest so keys remain
+       recognizable when inspected with `redis-cli` (e.g., `SCAN 0 MATCH *get_user*`).
+    4. The key is returned as `bytes`, which redis-py sends as-is without
+       re-encoding it.
+    5. Arguments must be picklable, but not necessarily hashable. Top-level dict
+       and set arguments are replaced by their sorted items (see `_canon_value`),
+       since equal values must pickle to equal bytes to share a key.
+    6. The payload is pickled with memoization disabled (`Pickler.fast`). With
+       memoization, an object passed twice (`f(x, x)`) is pickled once and then
+       referenced, so it would get a different key than an equal copy
+       (`f(x, list(x))`). As a consequence, self-referencing (recursive)
+       arguments are not supported.
+    """
+
+    positional = drop_self(args)
+    if arg_names is not None and len(positional) <= len(arg_names):
+        kwargs = {**dict(zip(arg_names, positional)), **kwargs}
+        positional = ()
+
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=5)
+    # `Pickler.fast` is documented as deprecated. If a future Python drops it, equal
+    # arguments passed twice would pickle differently and every key would change;
+    # the key stability check in `playground-testing/test-sync.ipynb` catches this.
+    pickler.fast = True
+    pickler.dump((tuple(map(_canon_value, positional)), _canon_kwargs(kwargs)))
+    return key_prefix + hashlib.blake2b(buffer.getbuffer(), digest_size=16).digest()
+
+
+def redis_cached(
+    ttl: int | Callable[[], int],
+    serializer: Serializer,
+    refresh_on_hit: bool = False,
+    refresh_probability: float = 1.0,
+):
     """
     Factory for creating cache decorators for sync and async functions.
 
@@ -66,74 +327,574 @@ def redis_cached(ttl: int, serializer: Serializer):
     the fully qualified function name and its arguments. Results are encoded
     and decoded using the provided serializer.
 
+    Each decorated function also gets its own bounded in-process L1 cache
+    (see `LocalTTLCache`), checked before Redis. A hit there is served without
+    a network round-trip or deserialization. Values read from Redis are fetched
+    together with their remaining TTL (`PTTL`, in the same round-trip) and kept
+    in the L1 cache no longer than that, so a value is never served after its
+    Redis entry has expired (with `refresh_on_hit`, see below, only half as long).
+    The L1 cache is exposed as the `local_cache`
+    attribute of the returned wrapper so that `invalidate_redis_cache` can evict
+    entries from it.
+
+    On a miss, the `SETEX` of the computed result and the increment of the
+    function's miss counter (`stats:<prefix>:miss`) are sent in a single
+    non-transactional pipeline, i.e. one round-trip instead of two. The write
+    is not awaited by the caller: sync functions hand it over to a background
+    writer thread (`get_write_behind()`), async functions to the event loop.
+
+    For async functions, reads and writes additionally go through
+    `get_async_coalescer()`, so concurrent calls in the same event-loop tick share
+    a single `MGET` and a single write pipeline.
+
+    Concurrent misses of the same key within a process are coalesced
+    (see `SingleFlight`): only the first caller runs the function, while the
+    others wait for it and then return the freshly cached result. This prevents
+    a thundering herd of identical expensive computations (e.g., `run_prediction`).
+
     Parameters
     ----------
-    ttl : int
-        Time-to-live (in seconds) for the cached entry.
+    ttl : int or Callable[[], int]
+        Time-to-live (in seconds) for the cached entry, or a function returning
+        it, called once on first use (see `_lazy_ttl`). Pass a function to read
+        the TTL from the configuration without loading it at import time.
     serializer : Serializer
         Serializer instance for converting results to/from bytes.
+    refresh_on_hit : bool
+        If `True`, reading an entry from Redis resets its TTL to `ttl` in the same
+        round-trip (`GETEX key EX ttl`), so frequently read entries never expire and
+        their expensive recomputation (e.g., `run_prediction`) is not triggered.
+        Since L1 hits never reach Redis, L1 entries then live for only half of the
+        remaining Redis TTL (at most `ttl / 2`): a hot key goes back to Redis, and
+        refreshes its TTL there, well before the Redis entry would expire.
+        Leave it `False` when entries must expire `ttl` seconds after being computed.
+        Default is `False`.
+    refresh_probability : float
+        Probability (0 to 1) that a Redis hit refreshes the TTL when `refresh_on_hit`
+        is enabled; other hits use a plain `GET`. Values below `1.0` avoid a write
+        on every read of very hot keys while still keeping them alive: a plain `GET`
+        that finds the entry in the second half of its life still extends it, with a
+        fire-and-forget `EXPIRE`. Default is `1.0`.
     """
 
+    get_ttl = _lazy_ttl(ttl)
+    # Share of the remaining Redis TTL an L1 entry may live for (see `refresh_on_hit`)
+    local_ratio = 0.5 if refresh_on_hit else 1.0
+
+    def local_ttl(pttl: int) -> float | None:
+        return _local_ttl(pttl, local_ratio)
+
+    def expires_soon(pttl: int) -> bool:
+        # A plain `GET` (see `refresh_probability`) of an entry in the second half of its
+        # life: the L1 cache keeps this process from reading it again before it expires
+        # in Redis, so it is extended right away with a fire-and-forget `EXPIRE`
+        return refresh_on_hit and 0 <= pttl < get_ttl() * 500
+
+    def refresh() -> int | None:
+        # TTL to reset on a Redis hit, or `None` for a plain `GET`
+        if not refresh_on_hit or (refresh_probability < 1.0 and random() >= refresh_probability):
+            return None
+        return get_ttl()
+
     def decorator(func: Callable[..., Any]):
         # Automatically generate a stable, namespaced cache key prefix
-        key_prefix = f"{func.__module__}.{func.__qualname__}"
+        key_prefix = f"{func.__module__}.{func.__qualname__}:".encode()
+        local_cache = LocalTTLCache(maxsize=LOCAL_CACHE_MAXSIZE, ttl=lambda: get_ttl() * local_ratio)
+        stats_key = b"stats:" + key_prefix + b"miss"
+        arg_names = positional_arg_names(func)
+        sync_flights = SingleFlight()
+        async_flights = AsyncSingleFlight()
+        # The serializer and L1 cache are fixed at decoration time: bind their methods
+        # once so the wrappers call local names instead of resolving attributes per call.
+        # Clients (and the coalescer / background writer) are only created on first use,
+        # so each wrapper resolves them on its first L1 miss and keeps them afterwards.
+        serialize = serializer.serialize
+        deserialize = serializer.deserialize
+        local_get = local_cache.get
+        local_set = local_cache.set
+        coalescer = client = writer = None
 
+        # Pick the branch before defining the wrapper, so only the closure
+        # that is actually returned gets created.
         # Preserve original function's metadata (name, docstring, etc.) in the wrapper
         # so that introspection, debugging, and key generation (e.g., __qualname__) work correctly.
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            key = f"{key_prefix}:{drop_self(args)}:{kwargs}"
-            raw_data = await async_redis_client.get(key)
-            if raw_data is not None:
-                return serializer.deserialize(raw_data)
-
-            result = await func(*args, **kwargs)
-            serialized = serializer.serialize(result)
-            await async_redis_client.setex(key, ttl, serialized)
-            return result
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                nonlocal coalescer
+                key = make_cache_key(key_prefix, args, kwargs, arg_names)
+                value = local_get(key)
+                if value is not MISS:
+                    return value
 
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            key = f"{key_prefix}:{drop_self(args)}:{kwargs}"
-            raw_data = sync_redis_client.get(key)
-            if raw_data is not None:
-                return serializer.deserialize(raw_data)
-
-            result = func(*args, **kwargs)
-            serialized = serializer.serialize(result)
-            sync_redis_client.setex(key, ttl, serialized)
-            return result
+                if coalescer is None:
+                    coalescer = get_async_coalescer()
+                ex = refresh()
+                raw_data, pttl = await coalescer.get(key, ex)
+                if raw_data is not None:
+                    if ex is None and expires_soon(pttl):
+                        coalescer.expire_nowait(key, get_ttl())
+                    value = deserialize(raw_data)
+                    local_set(key, value, local_ttl(pttl))
+                    return value
+
+                async with async_flights.hold(key) as contended:
+                    # Another caller may have computed the result while this one was waiting
+                    value = local_get(key)
+                    if value is not MISS:
+                        return value
+                    if contended:
+                        raw_data, pttl = await coalescer.get(key)
+                        if raw_data is not None:
+                            value = deserialize(raw_data)
+                            local_set(key, value, local_ttl(pttl))
+                            return value
+
+                    result = await func(*args, **kwargs)
+                    serialized = serialize(result)
+                    coalescer.setex_nowait(key, get_ttl(), serialized, stats_key)
+                    local_set(key, result)
+                    return result
+
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                nonlocal client, writer
+                key = make_cache_key(key_prefix, args, kwargs, arg_names)
+                value = local_get(key)
+                if value is not MISS:
+                    return value
+
+                if client is None:
+                    client, writer = get_sync_client(), get_write_behind()
+                ex = refresh()
+                raw_data, pttl = _read_sync(client, key, ex)
+                if raw_data is not None:
+                    if ex is None and expires_soon(pttl):
+                        writer.expire(key, get_ttl())
+                    value = deserialize(raw_data)
+                    local_set(key, value, local_ttl(pttl))
+                    return value
+
+                with sync_flights.hold(key) as contended:
+                    # Another caller may have computed the result while this one was waiting
+                    value = local_get(key)
+                    if value is not MISS:
+                        return value
+                    if contended:
+                        raw_data, pttl = _read_sync(client, key)
+                        if raw_data is not None:
+                            value = deserialize(raw_data)
+                            local_set(key, value, local_ttl(pttl))
+                            return value
+
+                    result = func(*args, **kwargs)
+                    serialized = serialize(result)
+                    writer.setex(key, get_ttl(), serialized, stats_key)
+                    local_set(key, result)
+                    return result
+
+        # Expose caching settings so that companion helpers
+        # (`invalidate_redis_cache`, `redis_cached_batch`, `redis_cached_mget`) can reuse them
+        wrapper.local_cache = local_cache
+        wrapper.key_prefix = key_prefix
+        wrapper.stats_key = stats_key
+        wrapper.arg_names = arg_names
+        wrapper.get_ttl = get_ttl
+        wrapper.local_ttl = local_ttl
+        wrapper.expires_soon = expires_soon
+        wrapper.serializer = serializer
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
+
+
+def redis_cached_batch(cached_func: Callable, calls: list[tuple[tuple, dict]]):
+    """
+    Resolve many independent calls of a `redis_cached` function in two round-trips.
+
+    Instead of paying one `GET` (and, on a miss, one more pipeline) per call,
+    all `GET`s (with the `PTTL`s bounding the L1 lifetime, see `redis_cached`)
+    are sent in a single pipeline, the missing results are computed,
+    and all their `SETEX`s (plus the miss counter update) are sent in a second
+    pipeline — two round-trips regardless of the number of calls.
+
+    Parameters
+    ----------
+    cached_func : Callable
+        Function or bound method decorated with `redis_cached`
+        (e.g., `service.get_user`).
+    calls : list[tuple[tuple, dict]]
+        Arguments of each call as `(args, kwargs)` pairs, passed exactly as
+        they would be passed to `cached_func`.
+
+    Returns
+    -------
+    list[Any] or Awaitable[list[Any]]
+        Results in the same order as `calls`. If `cached_func` is a coroutine
+        function, an awaitable resolving to that list is returned instead.
+
+    Raises
+    ------
+    TypeError
+        If `cached_func` is not decorated with `redis_cached`.
+
+    Notes
+    -----
+    Calls that map to the same cache key (e.g., `((1,), {})` and
+    `((), {"user_id": 1})`) are looked up, computed and written once, and share
+    the same result.
+
+    Examples
+    --------
+    >>> redis_cached_batch(service.get_user, [((1,), {}), ((2,), {})])
+    >>> await redis_cached_batch(async_service.get_user, [((), {"user_id": 1})])
+    """
+
+    if not hasattr(cached_func, "key_prefix"):
+        raise TypeError(f"{cached_func!r} is not decorated with `redis_cached`")
+
+    func = cached_func.__wrapped__
+    bound_self = getattr(cached_func, "__self__", None)
+    local_cache = cached_func.local_cache
+    local_ttl = cached_func.local_ttl
+    # Bound once per batch instead of being resolved for every call in it
+    serialize = cached_func.serializer.serialize
+    deserialize = cached_func.serializer.deserialize
+    local_set = local_cache.set
+    ttl = cached_func.get_ttl()
+    ex = cached_func.refresh()
+
+    # Re-attach `self` for bound methods: the key is built (and the original
+    # function is called) with the same positional arguments as in `redis_cached`
+    full_calls = [
+        ((bound_self, *args) if bound_self is not None else tuple(args), kwargs)
+        for args, kwargs in calls
+    ]
+    keys = [
+        make_cache_key(cached_func.key_prefix, args, kwargs, cached_func.arg_names)
+        for args, kwargs in full_calls
+    ]
+    # Index of the first call of each unique key; duplicates reuse its result
+    first = {}
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+    results = [MISS] * len(keys)
+    for i in first.values():
+        results[i] = local_cache.get(keys[i])
+    remote = [i for i in first.values() if results[i] is MISS]
 
-        return async_wrapper if iscoroutinefunction(func) else sync_wrapper
+    def collect():
+        return [results[first[key]] for key in keys]
+
+    def queue_reads(pipe):
+        for i in remote:
+            if ex is None:
+                pipe.get(keys[i])
+            else:
+                pipe.getex(keys[i], ex=ex)
+        for i in remote:
+            pipe.pttl(keys[i])
+
+    # Hits to extend with `EXPIRE` in the write pipeline (see `redis_cached`)
+    expiring = []
+
+    def resolve_hits(replies):
+        misses = []
+        for i, raw_data, pttl in zip(remote, replies, replies[len(remote):]):
+            if raw_data is None:
+                misses.append(i)
+            else:
+                if ex is None and cached_func.expires_soon(pttl):
+                    expiring.append(i)
+                results[i] = deserialize(raw_data)
+                local_set(keys[i], results[i], local_ttl(pttl))
+        return misses
+
+    def queue_writes(pipe, misses):
+        for i in expiring:
+            pipe.expire(keys[i], ttl)
+        for i in misses:
+            pipe.setex(keys[i], ttl, serialize(results[i]))
+            local_set(keys[i], results[i])
+        if misses:
+            pipe.incrby(cached_func.stats_key, len(misses))
+
+    if iscoroutinefunction(func):
+        async def run_async():
+            if not remote:
+                return collect()
+            async with get_async_client().pipeline(transaction=False) as pipe:
+                queue_reads(pipe)
+                misses = resolve_hits(await pipe.execute())
+            if misses:
+                computed = await asyncio.gather(
+                    *(func(*full_calls[i][0], **full_calls[i][1]) for i in misses)
+                )
+                for i, result in zip(misses, computed):
+                    results[i] = result
+            if misses or expiring:
+                async with get_async_client().pipeline(transaction=False) as pipe:
+                    queue_writes(pipe, misses)
+                    await pipe.execute()
+            return collect()
+
+        return run_async()
+
+    if not remote:
+        return collect()
+    with get_sync_client().pipeline(transaction=False) as pipe:
+        queue_reads(pipe)
+        misses = resolve_hits(pipe.execute())
+    for i in misses:
+        results[i] = func(*full_calls[i][0], **full_calls[i][1])
+    if misses or expiring:
+        with get_sync_client().pipeline(transaction=False) as pipe:
+            queue_writes(pipe, misses)
+            pipe.execute()
+    return collect()
+
+
+def redis_cached_mget(ttl: int | Callable[[], int], serializer: Serializer, item_func: Callable | None = None):
+    """
+    Factory for creating cache decorators for batch lookups by a list of ids.
+
+    The decorated function must accept a list of ids (after `self`) and return
+    a list of results in the same order. The wrapper looks all ids up with a
+    single `MGET` (pipelined with the `PTTL`s bounding the L1 lifetime, see
+    `redis_cached`), calls the function once with the ids that were missing, and
+    writes their results back with a single pipeline of `SETEX`s — so a lookup
+    of N ids costs at most two round-trips instead of N.
+
+    Parameters
+    ----------
+    ttl : int or Callable[[], int]
+        Time-to-live (in seconds) for each cached entry, or a function returning
+        it, called once on first use (see `redis_cached`).
+    serializer : Serializer
+        Serializer instance for converting each result to/from bytes.
+    item_func : Callable or None
+        Optional single-id function decorated with `redis_cached`
+        (e.g., `get_user`). If given, each id is cached under the same key as
+        `item_func(self, id)`, so batch and single lookups share entries (and
+        `invalidate_redis_cache(target_func=item_func)` invalidates both).
+        Its `ttl` and `serializer` should match the ones passed here.
+        Otherwise, ids are cached under the decorated function's own prefix.
+        Default is `None`.
+
+    Raises
+    ------
+    TypeError
+        If `item_func` is not decorated with `redis_cached`.
+    ValueError
+        If the decorated function returns a different number of results than
+        the number of ids it was called with.
+
+    Notes
+    -----
+    1. Ids must be hashable. Duplicate ids are looked up and computed once.
+    2. The list of ids may be passed positionally or by the name of its parameter
+       (e.g., `get_users(user_ids=[1, 2])`). Other arguments are passed through to
+       the decorated function unchanged, but are not part of the cache key.
+    3. Unlike `redis_cached`, concurrent misses are not coalesced per key,
+       since batches of different callers rarely contain exactly the same ids.
+
+    Examples
+    --------
+    >>> @redis_cached_mget(ttl=300, serializer=JSON, item_func=get_user)
+    ... def get_users(self, user_ids: list[int]) -> list[dict]: ...
+    """
+
+    if item_func is not None and not hasattr(item_func, "key_prefix"):
+        raise TypeError(f"{item_func!r} is not decorated with `redis_cached`")
+
+    get_ttl = _lazy_ttl(ttl)
+
+    def decorator(func: Callable[..., Any]):
+        if item_func is not None:
+            key_prefix = item_func.key_prefix
+            arg_names = item_func.arg_names
+            local_cache = item_func.local_cache
+            local_ttl = item_func.local_ttl
+        else:
+            key_prefix = f"{func.__module__}.{func.__qualname__}:".encode()
+            arg_names = None
+            local_cache = LocalTTLCache(maxsize=LOCAL_CACHE_MAXSIZE, ttl=get_ttl)
+            local_ttl = _local_ttl
+        stats_key = b"stats:" + key_prefix + b"miss"
+        # Bound once at decoration time, as in `redis_cached`
+        serialize = serializer.serialize
+        deserialize = serializer.deserialize
+        local_get = local_cache.get
+        local_set = local_cache.set
+        func_signature = signature(func)
+        # Parameters holding `self` and the list of ids
+        self_name, ids_name = list(func_signature.parameters)[:2]
+
+        def bind(args, kwargs):
+            bound = func_signature.bind(*args, **kwargs)
+            return bound, bound.arguments[self_name], bound.arguments[ids_name]
+
+        def compute_args(bound, missing):
+            # Arguments of the call, with the ids replaced by the missing ones
+            bound.arguments[ids_name] = missing
+            return bound.args, bound.kwargs
+
+        def lookup(self, ids):
+            # Unique ids with their keys, and the ids not found in the L1 cache
+            keys = {id_: make_cache_key(key_prefix, (self, id_), {}, arg_names) for id_ in ids}
+            found = {}
+            for id_, key in keys.items():
+                value = local_get(key)
+                if value is not MISS:
+                    found[id_] = value
+            remote = [id_ for id_ in keys if id_ not in found]
+            return keys, found, remote
+
+        def queue_reads(pipe, keys, remote):
+            pipe.mget([keys[id_] for id_ in remote])
+            for id_ in remote:
+                pipe.pttl(keys[id_])
+
+        def resolve_hits(keys, found, remote, replies):
+            missing = []
+            for id_, raw_data, pttl in zip(remote, replies[0], replies[1:]):
+                if raw_data is None:
+                    missing.append(id_)
+                else:
+                    found[id_] = deserialize(raw_data)
+                    local_set(keys[id_], found[id_], local_ttl(pttl))
+            return missing
+
+        def check_results(missing, results):
+            if len(results) != len(missing):
+                raise ValueError(
+                    f"{func.__qualname__} returned {len(results)} results "
+                    f"for {len(missing)} ids; expected one result per id, in order"
+                )
+
+        def queue_writes(pipe, keys, found, missing, results):
+            for id_, result in zip(missing, results):
+                found[id_] = result
+                pipe.setex(keys[id_], get_ttl(), serialize(result))
+                local_set(keys[id_], result)
+            pipe.incrby(stats_key, len(missing))
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                bound, self, ids = bind(args, kwargs)
+                keys, found, remote = lookup(self, ids)
+                if remote:
+                    client = get_async_client()
+                    async with client.pipeline(transaction=False) as pipe:
+                        queue_reads(pipe, keys, remote)
+                        missing = resolve_hits(keys, found, remote, await pipe.execute())
+                    if missing:
+                        call_args, call_kwargs = compute_args(bound, missing)
+                        results = await func(*call_args, **call_kwargs)
+                        check_results(missing, results)
+                        async with client.pipeline(transaction=False) as pipe:
+                            queue_writes(pipe, keys, found, missing, results)
+                            await pipe.execute()
+                return [found[id_] for id_ in ids]
+
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                bound, self, ids = bind(args, kwargs)
+                keys, found, remote = lookup(self, ids)
+                if remote:
+                    client = get_sync_client()
+                    with client.pipeline(transaction=False) as pipe:
+                        queue_reads(pipe, keys, remote)
+                        missing = resolve_hits(keys, found, remote, pipe.execute())
+                    if missing:
+                        call_args, call_kwargs = compute_args(bound, missing)
+                        results = func(*call_args, **call_kwargs)
+                        check_results(missing, results)
+                        with client.pipeline(transaction=False) as pipe:
+                            queue_writes(pipe, keys, found, missing, results)
+                            pipe.execute()
+                return [found[id_] for id_ in ids]
+
+        wrapper.local_cache = local_cache
+        return wrapper
     return decorator
 
 
-def invalidate_redis_cache(target_func: Callable):
+def invalidate_redis_cache(
+    target_func: Callable,
+    key_args: Callable[[tuple, dict], tuple[tuple, dict]] = lambda args, kwargs: (args, kwargs),
+):
     """
     Factory for creating cache invalidation decorators for sync and async functions.
 
+    After the mutating function returns, the cache entry of `target_func` is removed
+    both from its in-process L1 cache and from Redis. The Redis key is removed with
+    `UNLINK`, which frees the value in a background thread instead of blocking the
+    server like `DEL` does for large values.
+
+    The `UNLINK` is sent through the same queue as the fire-and-forget cache writes
+    of `redis_cached` (`get_write_behind()` or `get_async_coalescer()`), after all
+    writes queued before it. Otherwise a pending write of the old value could
+    reach Redis after the `UNLINK` and restore the stale entry.
+
     Parameters
     ----------
     target_func : Callable
         The function whose cache should be invalidated (e.g., get_user).
+    key_args : Callable[[tuple, dict], tuple[tuple, dict]]
+        Maps the arguments of the mutating function (positional arguments without
+        `self`, and keyword arguments) to the arguments `target_func` would be
+        called with. The key is then built exactly as in `redis_cached`.
+        Default passes the arguments through unchanged, which is only correct
+        if both functions share the same signature.
+
+    Examples
+    --------
+    `update_user(self, user_id, **updates)` must drop `updates` to target
+    `get_user(self, user_id)`:
+
+    >>> @invalidate_redis_cache(
+    ...     target_func=get_user,
+    ...     key_args=lambda args, kwargs: ((args[0] if args else kwargs["user_id"],), {}),
+    ... )
+    ... def update_user(self, user_id, **updates): ...
     """
 
-    target_key_prefix = f"{target_func.__module__}.{target_func.__qualname__}"
+    target_key_prefix = f"{target_func.__module__}.{target_func.__qualname__}:".encode()
+    target_arg_names = positional_arg_names(target_func)
+    # L1 cache attached by `redis_cached`; absent if the target is not decorated
+    target_local_cache = getattr(target_func, "local_cache", None)
+
+    def target_key(args: tuple, kwargs: dict) -> bytes:
+        target_args, target_kwargs = key_args(drop_self(args), kwargs)
+        return make_cache_key(
+            target_key_prefix, args[:1] + tuple(target_args), target_kwargs, target_arg_names
+        )
 
     def decorator(mutating_func: Callable[..., Any]):
-        #@wraps(mutating_func)
-        async def async_wrapper(*args, **kwargs):
-            result = await mutating_func(*args, **kwargs)
-            key = f"{target_key_prefix}:{drop_self(args)}:{kwargs}"
-            await async_redis_client.delete(key)
-            return result
+        if iscoroutinefunction(mutating_func):
+            #@wraps(mutating_func)
+            async def async_wrapper(*args, **kwargs):
+                result = await mutating_func(*args, **kwargs)
+                key = target_key(args, kwargs)
+                if target_local_cache is not None:
+                    target_local_cache.pop(key, None)
+                await get_async_coalescer().unlink(key)
+                return result
+
+            return async_wrapper
 
         #@wraps(mutating_func)
         def sync_wrapper(*args, **kwargs):
             result = mutating_func(*args, **kwargs)
-            key = f"{target_key_prefix}:{drop_self(args)}:{kwargs}"
-            sync_redis_client.delete(key)
+            key = target_key(args, kwargs)
+            if target_local_cache is not None:
+                target_local_cache.pop(key, None)
+            get_write_behind().unlink(key)
             return result
 
-        return async_wrapper if iscoroutinefunction(mutating_func) else sync_wrapper
+        return sync_wrapper
     return decorator
\ No newline at end of file
@@ -0,0 +1,41 @@
+# app/db/event_loop.py
+import asyncio
+from typing import Any, Coroutine
+
+# `uvloop` is an optional, faster drop-in replacement for the default event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on the fastest available event loop.
+
+    Intended as the entrypoint of applications that use the asynchronous
+    client (`get_async_client`), in place of `asyncio.run(main)`.
+
+    Parameters
+    ----------
+    main : Coroutine
+        Top-level coroutine of the application.
+
+    Returns
+    -------
+    Any
+        The value returned by `main`.
+
+    Notes
+    -----
+    1. When `uvloop` is installed, the coroutine runs on a uvloop event loop.
+       Its transports write buffered data with a single `writev` syscall, so a
+       pipelined batch of commands (see `Coalescer`) leaves the process in one
+       syscall rather than one `send` per command. Otherwise, `asyncio.run` is used.
+    2. The loop must be chosen before it starts. Code that already runs inside
+       an event loop (e.g., a Jupyter notebook) keeps using that loop.
+    """
+
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
\ No newline at end of file
@@ -0,0 +1,146 @@
+# app/db/local_cache.py
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+
+MISS = object()
+"""
+Sentinel returned by `LocalTTLCache.get` when a key is absent or expired.
+
+A dedicated sentinel is required because `None` (and any other value) is a
+perfectly valid cached result and cannot be used to signal a miss.
+"""
+
+
+class LocalTTLCache:
+    """
+    Bounded, TTL-aware in-process cache used as an L1 layer in front of Redis.
+
+    Entries are stored in an `OrderedDict` as `(expires_at, value)` pairs and
+    kept in least-recently-used order: every hit moves the entry to the end,
+    and when the cache grows beyond `maxsize` the oldest entry is evicted.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept in memory.
+    ttl : int or Callable[[], int]
+        Time-to-live (in seconds) for each entry, or a function returning it,
+        called once on first use (e.g., to read it from the configuration lazily).
+
+    Notes
+    -----
+    1. Serving a hit from this cache is a plain dictionary lookup: no network
+       round-trip to Redis and no deserialization.
+    2. Values are stored by reference, exactly as returned by the decorated
+       function. Callers must not mutate cached results in place.
+    3. Values read from Redis should be stored with the remaining TTL of their
+       Redis entry (see `set`), so that an entry never outlives the Redis entry
+       it was read from.
+    4. The cache is local to the current process. Invalidation performed by
+       another process only reaches Redis, so an entry here may stay stale
+       for at most `ttl` seconds.
+    5. Operations are guarded by a lock so that the cache can be shared by
+       threads; the critical sections are short and never block on I/O,
+       which makes it safe to use from async code as well.
+    """
+
+    def __init__(self, maxsize: int, ttl: int | Callable[[], int]):
+        self.maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def ttl(self) -> int:
+        """
+        Time-to-live (in seconds) for each entry.
+        """
+
+        if callable(self._ttl):
+            self._ttl = self._ttl()
+        return self._ttl
+
+    def get(self, key: Hashable, default: Any = MISS) -> Any:
+        """
+        Return the cached value for `key`, or `default` if absent or expired.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key.
+        default : Any
+            Value returned on a miss. Default is `MISS`.
+
+        Returns
+        -------
+        Any
+            The cached value or `default`.
+        """
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        """
+        Store `value` under `key` for `ttl` seconds (see `set`).
+        """
+
+        self.set(key, value)
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entry if full.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key.
+        value : Any
+            Value to cache.
+        ttl : float or None
+            Lifetime of the entry in seconds, e.g. the remaining TTL of the Redis
+            entry the value was read from. Values above the cache's own `ttl` are
+            capped to it, and a non-positive value removes `key` instead of
+            storing it. Default is `None` (the cache's own `ttl`).
+        """
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if ttl <= 0:
+                self._data.pop(key, None)
+                return
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove `key` from the cache and return its value, or `default` if absent.
+        """
+
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,9 +1,24 @@
 # app/db/serializers.py
 import json
 import pickle
+import struct
+import threading
 from abc import ABC, abstractmethod
 from typing import Any
 
+# `orjson` is an optional accelerator: it encodes straight to UTF-8 bytes in C,
+# avoiding the separate `str` -> `bytes` pass of the standard library `json`
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# `zstandard` is only required by `CompressedSerializer`
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 class Serializer(ABC):
     """
@@ -59,6 +74,13 @@ class JsonSerializer(Serializer):
 
     Converts Python objects to JSON-formatted UTF-8 bytes and back.
     Only supports JSON-serializable types: dict, list, str, int, float, bool, None.
+
+    Notes
+    -----
+    Uses `orjson` when it is installed and falls back to the standard library
+    `json` module otherwise. With `orjson`, non-string dictionary keys are
+    converted to strings (as `json` does) and NumPy arrays are serialized
+    natively as lists.
     """
 
     def serialize(self, obj: Any) -> bytes:
@@ -81,6 +103,10 @@ class JsonSerializer(Serializer):
             If the object contains non-JSON-serializable types.
         """
 
+        if orjson is not None:
+            return orjson.dumps(
+                obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
         return json.dumps(obj).encode('utf-8')
 
     def deserialize(self, data: bytes) -> Any:
@@ -103,6 +129,8 @@ class JsonSerializer(Serializer):
             If the input is not valid JSON.
         """
 
+        if orjson is not None:
+            return orjson.loads(data)
         return json.loads(data.decode('utf-8'))
 
 
@@ -112,8 +140,26 @@ class PickleSerializer(Serializer):
 
     Converts arbitrary Python objects to pickle byte streams and back.
     Supports complex types including custom classes, nested objects, and closures.
+
+    Notes
+    -----
+    1. Objects are pickled with protocol 5 (PEP 574). Objects that expose their data
+       as out-of-band buffers (e.g., NumPy arrays) are not copied into the pickle
+       stream; instead, the stream and the raw buffers are packed into a single
+       frame:
+
+           b"B" | <uint32 buffer count n> | <n + 1 uint64 sizes> | <pickle> | <buffer 0> ...
+
+       Payloads without out-of-band buffers are stored as a plain pickle stream,
+       which always starts with the `PROTO` opcode (`b"\x80"`) and is therefore
+       distinguishable from a frame.
+    2. On deserialization, out-of-band buffers are passed to `pickle.loads` as
+       zero-copy views into the received bytes, so large arrays are rebuilt without
+       copying their data. Such arrays are read-only; call `.copy()` to mutate them.
     """
 
+    _FRAME_MARKER = b"B"
+
     def serialize(self, obj: Any) -> bytes:
         """
         Convert a Python object to a pickle byte stream.
@@ -134,7 +180,19 @@ class PickleSerializer(Serializer):
             If the object cannot be pickled (e.g., lambda, open file, etc.).
         """
 
-        return pickle.dumps(obj)
+        buffers: list[pickle.PickleBuffer] = []
+        payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        if not buffers:
+            return payload
+
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        header = struct.pack(
+            f"<I{len(raw_buffers) + 1}Q",
+            len(raw_buffers),
+            len(payload),
+            *(raw.nbytes for raw in raw_buffers),
+        )
+        return b"".join([self._FRAME_MARKER, header, payload, *raw_buffers])
 
     def deserialize(self, data: bytes) -> Any:
         """
@@ -156,4 +214,134 @@ class PickleSerializer(Serializer):
             If the data is corrupted or not a valid pickle stream.
         """
 
-        return pickle.loads(data)
\ No newline at end of file
+        if data[:1] != self._FRAME_MARKER:
+            return pickle.loads(data)
+
+        view = memoryview(data)
+        (count,) = struct.unpack_from("<I", view, 1)
+        sizes = struct.unpack_from(f"<{count + 1}Q", view, 5)
+        offset = 5 + 8 * (count + 1)
+
+        chunks = []
+        for size in sizes:
+            chunks.append(view[offset:offset + size])
+            offset += size
+        return pickle.loads(chunks[0], buffers=chunks[1:])
+
+
+# Serializers are stateless, so a single shared instance of each is enough
+JSON = JsonSerializer()
+PICKLE = PickleSerializer()
+
+
+class CompressedSerializer(Serializer):
+    """
+    Zstandard compression wrapper around another serialization strategy.
+
+    Payloads produced by the inner serializer that are larger than `threshold`
+    bytes are compressed with zstd; smaller ones are stored as-is, since
+    compressing them would cost CPU time without a meaningful size reduction.
+
+    Parameters
+    ----------
+    inner : Serializer
+        Serializer producing the uncompressed payload (e.g., `PickleSerializer`).
+    threshold : int
+        Minimum payload size (in bytes) that triggers compression.
+        Default is `512`.
+    level : int
+        Zstandard compression level. Default is `3`.
+    dict_data : zstandard.ZstdCompressionDict or None
+        Optional pre-trained dictionary (see `zstandard.train_dictionary`), which
+        improves the ratio for many small payloads sharing the same structure.
+        The same dictionary must be used by every reader. Default is `None`.
+
+    Raises
+    ------
+    ImportError
+        If the `zstandard` package is not installed.
+
+    Notes
+    -----
+    1. Each stored payload is prefixed with a single marker byte: `b"Z"` for a
+       compressed payload and `b"R"` for a raw one.
+    2. Zstandard compressor and decompressor objects are expensive to create but
+       must not be used by several threads at once, so one pair is created lazily
+       per thread and reused for all subsequent calls.
+    """
+
+    _COMPRESSED = b"Z"
+    _RAW = b"R"
+
+    def __init__(
+        self,
+        inner: Serializer,
+        threshold: int = 512,
+        level: int = 3,
+        dict_data: "zstandard.ZstdCompressionDict | None" = None,
+    ):
+        if zstandard is None:
+            raise ImportError("`CompressedSerializer` requires the `zstandard` package")
+        self.inner = inner
+        self.threshold = threshold
+        self.level = level
+        self.dict_data = dict_data
+        self._local = threading.local()
+
+    def _codecs(self):
+        local = self._local
+        if not hasattr(local, "compressor"):
+            local.compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self.dict_data)
+            local.decompressor = zstandard.ZstdDecompressor(dict_data=self.dict_data)
+        return local.compressor, local.decompressor
+
+    def serialize(self, obj: Any) -> bytes:
+        """
+        Serialize an object with the inner serializer and compress large payloads.
+
+        Parameters
+        ----------
+        obj : Any
+            An object supported by the inner serializer.
+
+        Returns
+        -------
+        bytes
+            Marker byte followed by the (possibly compressed) payload.
+        """
+
+        raw = self.inner.serialize(obj)
+        if len(raw) <= self.threshold:
+            return self._RAW + raw
+        compressor, _ = self._codecs()
+        return self._COMPRESSED + compressor.compress(raw)
+
+    def deserialize(self, data: bytes) -> Any:
+        """
+        Decompress a payload if needed and reconstruct the object with the inner serializer.
+
+        Parameters
+        ----------
+        data : bytes
+            Marker byte followed by the (possibly compressed) payload.
+
+        Returns
+        -------
+        Any
+            The deserialized Python object.
+
+        Raises
+        ------
+        ValueError
+            If the payload does not start with a known marker byte.
+        zstandard.ZstdError
+            If the compressed payload is corrupted.
+        """
+
+        marker = data[:1]
+        if marker == self._RAW:
+            return self.inner.deserialize(data[1:])
+        if marker == self._COMPRESSED:
+            _, decompressor = self._codecs()
+            return self.inner.deserialize(decompressor.decompress(memoryview(data)[1:]))
+        raise ValueError(f"Unknown payload marker: {marker!r}")
\ No newline at end of file
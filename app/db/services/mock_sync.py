@@ -1,9 +1,10 @@
 # app/db/services/mock_sync.py
 import time
 from typing import Any
-from ..config import redis_config
-from ..serializers import JsonSerializer, PickleSerializer
-from ..decorators import redis_cached, invalidate_redis_cache
+import numpy as np
+from ..config import get_redis_config
+from ..serializers import JSON, PICKLE, CompressedSerializer
+from ..decorators import redis_cached, redis_cached_mget, invalidate_redis_cache
 
 
 class MockSyncService:
@@ -15,16 +16,19 @@ class MockSyncService:
     - Slow/expensive ML operations (use Pickle + ttl_slow)
     """
 
+    # TTLs are passed as functions, so the configuration is only loaded on first call
+    # rather than when this module is imported
     @redis_cached(
-        ttl=redis_config.ttl_slow, 
-        serializer=PickleSerializer()
+        ttl=lambda: get_redis_config().ttl_slow, 
+        serializer=CompressedSerializer(PICKLE)
     )
     def run_prediction(self, model_id: str, input_data: list[float]) -> dict[str, Any]:
         """
         Simulate running ML model inference.
 
         Result is cached with long TTL because inference is expensive.
-        Uses Pickle to support complex output structures.
+        Uses Pickle to support complex output structures, compressed with zstd
+        since prediction outputs can be large.
 
         Parameters
         ----------
@@ -42,13 +46,14 @@ class MockSyncService:
         time.sleep(20)  # Simulate heavy computation
         return {
             "model_id": model_id,
-            "prediction": [x * 0.5 for x in input_data],
+            # Vectorized scaling instead of a Python-level loop over `input_data`
+            "prediction": (np.asarray(input_data, dtype=np.float64) * 0.5).tolist(),
             "confidence": 0.95
         }
 
     @redis_cached(
-        ttl=redis_config.ttl_fast, 
-        serializer=JsonSerializer()
+        ttl=lambda: get_redis_config().ttl_fast, 
+        serializer=JSON
     )
     def get_user(self, user_id: int) -> dict[str, Any]:
         """
@@ -74,7 +79,44 @@ class MockSyncService:
             "email": f"user{user_id}@example.com"
         }
 
-    @invalidate_redis_cache(target_func=get_user)
+    @redis_cached_mget(
+        ttl=lambda: get_redis_config().ttl_fast, 
+        serializer=JSON,
+        item_func=get_user
+    )
+    def get_users(self, user_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Simulate retrieving several user profiles from a database in one query.
+
+        Shares cache entries with `get_user`: only the ids missing from the cache
+        are fetched, all at once, and cached individually.
+
+        Parameters
+        ----------
+        user_ids : list[int]
+            Unique user identifiers.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            User profiles, in the same order as `user_ids`.
+        """
+
+        time.sleep(5)
+        return [
+            {
+                "id": user_id, 
+                "name": f"User_{user_id}", 
+                "email": f"user{user_id}@example.com"
+            }
+            for user_id in user_ids
+        ]
+
+    @invalidate_redis_cache(
+        target_func=get_user,
+        # `**updates` are not part of `get_user`'s signature and must not reach its key
+        key_args=lambda args, kwargs: ((args[0] if args else kwargs["user_id"],), {})
+    )
     def update_user(self, user_id: int, **updates) -> dict[str, Any]:
         """
         Simulate updating a user's profile in a database.
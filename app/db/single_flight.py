@@ -0,0 +1,111 @@
+# app/db/single_flight.py
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Hashable, Iterator
+
+
+class SingleFlight:
+    """
+    Per-key mutual exclusion for synchronous cache misses.
+
+    When several threads miss the same key at once, only the first one computes
+    the result; the others wait for it and then read the freshly cached value
+    instead of repeating the (possibly very expensive) computation.
+
+    Notes
+    -----
+    1. A lock exists only while at least one caller holds or waits for it, so
+       memory usage is bounded by the number of keys being computed concurrently.
+    2. Coalescing is limited to the current process; concurrent misses in other
+       processes still compute the result independently.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        # key -> [lock, number of callers holding or waiting for it]
+        self._locks: dict[Hashable, list] = {}
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[bool]:
+        """
+        Hold the lock of `key` for the duration of the `with` block.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key being computed.
+
+        Yields
+        ------
+        bool
+            `True` if another caller was already computing `key` when this one
+            arrived, i.e. the cache should be checked again before computing.
+        """
+
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+            contended = entry[1] > 1
+
+        try:
+            with entry[0]:
+                yield contended
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+class AsyncSingleFlight:
+    """
+    Per-key mutual exclusion for asynchronous cache misses.
+
+    Asynchronous counterpart of `SingleFlight`: only the first coroutine that
+    misses a key computes the result, the others await it.
+
+    Notes
+    -----
+    Locks are bound to the event loop they are used on, so separate locks are
+    kept for each running loop.
+    """
+
+    def __init__(self):
+        # (loop, key) -> [lock, number of callers holding or waiting for it]
+        self._locks: dict[tuple, list] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[bool]:
+        """
+        Hold the lock of `key` for the duration of the `async with` block.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key being computed.
+
+        Yields
+        ------
+        bool
+            `True` if another coroutine was already computing `key` when this
+            one arrived, i.e. the cache should be checked again before computing.
+        """
+
+        # No guard is needed: the bookkeeping below never yields to the event loop
+        slot = (asyncio.get_running_loop(), key)
+        entry = self._locks.get(slot)
+        if entry is None:
+            entry = self._locks[slot] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        contended = entry[1] > 1
+
+        try:
+            async with entry[0]:
+                yield contended
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[slot]
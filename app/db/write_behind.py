@@ -0,0 +1,160 @@
+# app/db/write_behind.py
+import atexit
+import logging
+import threading
+from collections import deque
+from typing import Callable
+from redis import Redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehind:
+    """
+    Background writer for synchronous cache writes ("fire-and-forget").
+
+    Cache writes are appended to an in-memory queue and the caller returns
+    immediately; a dedicated daemon thread drains the queue and sends the
+    writes to Redis in non-transactional pipelines of up to `batch_size`
+    `SETEX`s (plus the matching miss-counter increments).
+
+    Parameters
+    ----------
+    client_factory : Callable[[], Redis]
+        Returns the synchronous client used by the writer thread.
+    maxsize : int
+        Maximum number of queued writes. When the queue is full, the oldest
+        pending write is dropped. Default is `10000`.
+    batch_size : int
+        Maximum number of writes sent in one pipeline. Default is `128`.
+
+    Notes
+    -----
+    1. This removes the write round-trip from the critical path of every miss.
+       The price is that a written value becomes visible to other processes
+       slightly later, and may be lost (e.g., on a crash or under backpressure);
+       for a cache this only means one more miss.
+    2. Failed writes are logged and discarded.
+    3. The writer thread is started on first use, and pending writes are flushed
+       when the interpreter exits.
+    4. Invalidations must go through `unlink` rather than the client directly:
+       a write queued before the invalidation could otherwise reach Redis after
+       the `UNLINK` and restore the stale value.
+    """
+
+    def __init__(self, client_factory: Callable[[], Redis], maxsize: int = 10000, batch_size: int = 128):
+        self._client_factory = client_factory
+        self._batch_size = batch_size
+        # `deque.append`/`popleft` are thread-safe; `maxlen` drops the oldest entry when full
+        self._queue: deque[tuple[bytes, int, bytes | None, bytes | None]] = deque(maxlen=maxsize)
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        # Held while batches are sent, so writes and unlinks reach Redis in queue order
+        self._send_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def setex(self, key: bytes, ttl: int, value: bytes, stats_key: bytes | None = None) -> None:
+        """
+        Queue a write of `key` with a TTL and return immediately.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        ttl : int
+            Time-to-live (in seconds) of the entry.
+        value : bytes
+            Serialized value.
+        stats_key : bytes or None
+            Counter incremented alongside the write (e.g., a miss counter).
+            Default is `None` (no counter).
+        """
+
+        self._queue.append((key, ttl, value, stats_key))
+        if self._thread is None:
+            self._start()
+        self._wakeup.set()
+
+    def expire(self, key: bytes, ttl: int) -> None:
+        """
+        Queue a reset of the TTL of `key` (`EXPIRE`) and return immediately.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        ttl : int
+            New time-to-live (in seconds) of the entry.
+        """
+
+        self._queue.append((key, ttl, None, None))
+        if self._thread is None:
+            self._start()
+        self._wakeup.set()
+
+    def unlink(self, key: bytes) -> None:
+        """
+        Remove `key` from Redis after all writes queued so far have been sent.
+
+        Unlike `setex`, this blocks until the `UNLINK` is done, and its errors
+        are raised to the caller.
+
+        Parameters
+        ----------
+        key : bytes
+            Redis key.
+        """
+
+        with self._send_lock:
+            self._drain()
+            self._client_factory().unlink(key)
+
+    def flush(self) -> None:
+        """
+        Send all pending writes from the calling thread.
+        """
+
+        with self._send_lock:
+            self._drain()
+
+    def _drain(self) -> None:
+        while self._queue:
+            self._send_batch()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="redis-write-behind", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+    def _send_batch(self) -> None:
+        batch = []
+        try:
+            while len(batch) < self._batch_size:
+                batch.append(self._queue.popleft())
+        except IndexError:
+            pass
+        if not batch:
+            return
+
+        try:
+            with self._client_factory().pipeline(transaction=False) as pipe:
+                for key, ttl, value, stats_key in batch:
+                    # Entries without a value only reset the TTL (see `expire`)
+                    if value is None:
+                        pipe.expire(key, ttl)
+                    else:
+                        pipe.setex(key, ttl, value)
+                    if stats_key is not None:
+                        pipe.incr(stats_key)
+                pipe.execute()
+        except Exception:
+            logger.exception("Failed to write %d cache entries to Redis", len(batch))